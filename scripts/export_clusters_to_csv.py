@@ -1,8 +1,11 @@
 """
-Export all players organized by cluster to a CSV file.
+Export all players organized by cluster to a CSV file (plus a Parquet copy).
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
 from pathlib import Path
 
 # Paths
@@ -12,17 +15,6 @@ OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def main():
-    # Load clustered data
-    data_file = PROCESSED_DIR / "forwards_clustered.csv"
-    
-    if not data_file.exists():
-        print(f"[ERROR] File not found: {data_file}")
-        print("   Run Notebook 03 (clustering) first!")
-        return
-    
-    df = pd.read_csv(data_file)
-    print(f"[OK] Loaded {len(df)} players")
-    
     # Select key columns for export
     key_columns = [
         'Player', 'Squad', 'Pos', 'Age', 'Nation',
@@ -33,35 +25,59 @@ def main():
         'Progression_PrgC_per90', 'SCA_SCA_per90'
     ]
     
+    # Load clustered data (Parquet copy if it is at least as new as the CSV)
+    data_file = PROCESSED_DIR / "forwards_clustered.csv"
+    parquet_file = data_file.with_suffix('.parquet')
+    
+    if parquet_file.exists() and (not data_file.exists() or
+                                  parquet_file.stat().st_mtime >= data_file.stat().st_mtime):
+        schema_cols = pq.read_schema(parquet_file).names
+        df = pd.read_parquet(parquet_file, columns=[c for c in key_columns if c in schema_cols])
+    elif data_file.exists():
+        df = pd.read_csv(data_file, usecols=lambda c: c in key_columns)
+    else:
+        print(f"[ERROR] File not found: {data_file}")
+        print("   Run Notebook 03 (clustering) first!")
+        return
+    
+    print(f"[OK] Loaded {len(df)} players")
+    
     # Use only available columns
     available_cols = [c for c in key_columns if c in df.columns]
     
     # Sort by cluster, then by goals per 90 within each cluster
+    # (df only holds the key columns, so there is no separate column-subset copy)
     sort_col = 'Performance_Gls_per90' if 'Performance_Gls_per90' in df.columns else 'cluster'
-    df_sorted = df[available_cols].sort_values(
+    df_sorted = df.sort_values(
         by=['cluster', sort_col], 
         ascending=[True, False]
     )
     
-    # Export to CSV
+    # Export to CSV for reading, Parquet as the typed artifact
     output_file = OUTPUT_DIR / "players_by_cluster.csv"
-    df_sorted.to_csv(output_file, index=False)
+    table = pa.Table.from_pandas(df_sorted, columns=available_cols, preserve_index=False)
+    pcsv.write_csv(table, str(output_file))
+    pq.write_table(table, str(output_file.with_suffix('.parquet')))
     print(f"[SAVED] {output_file}")
     
     # Print summary
     print("\nCLUSTER SUMMARY:")
     print("-" * 50)
-    for cluster_id in sorted(df['cluster'].unique()):
-        cluster_df = df[df['cluster'] == cluster_id]
-        cluster_name = cluster_df['cluster_name'].iloc[0] if 'cluster_name' in cluster_df.columns else f"Cluster {cluster_id}"
-        print(f"\nCluster {cluster_id}: {len(cluster_df)} players")
+    sizes = df_sorted.groupby('cluster').size()
+    names = (df_sorted.groupby('cluster')['cluster_name'].first()
+             if 'cluster_name' in df_sorted.columns else None)
+    # df_sorted is already ordered by goals within each cluster
+    top3 = df_sorted.groupby('cluster', sort=True).head(3)
+    
+    for cluster_id, group in top3.groupby('cluster', sort=True):
+        cluster_name = names[cluster_id] if names is not None else f"Cluster {cluster_id}"
+        print(f"\nCluster {cluster_id}: {sizes[cluster_id]} players")
         print(f"  {cluster_name}")
         
         # Show top 3 players by goals
-        if 'Performance_Gls_per90' in cluster_df.columns:
-            top3 = cluster_df.nlargest(3, 'Performance_Gls_per90')
-            for _, p in top3.iterrows():
-                print(f"    - {p['Player']} ({p['Squad']}) - {p['Performance_Gls_per90']:.2f} G/90")
+        if 'Performance_Gls_per90' in group.columns:
+            for p in group.itertuples(index=False):
+                print(f"    - {p.Player} ({p.Squad}) - {p.Performance_Gls_per90:.2f} G/90")
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@ Ghana Black Stars Analysis Script
 Runnable version of Notebook 04 with correct column names
 """
 
+import re
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -40,23 +41,49 @@ GHANA_PLAYERS = {
     "Christopher Bonsu Baah": ["Bonsu Baah", "C. Bonsu Baah", "Christopher Bonsu Baah"]
 }
 
+# Lowercased alias table built once at import: (canonical, alias, rank in alias list)
+_GHANA_ALIASES = pd.DataFrame(
+    [(canonical, alias.lower(), rank)
+     for canonical, aliases in GHANA_PLAYERS.items()
+     for rank, alias in enumerate([canonical] + aliases)],
+    columns=['canonical', 'alias', 'rank']
+)
 
-def find_player(df, name, aliases):
-    """Find a player by name or aliases"""
-    all_names = [name] + aliases
-    
-    for search_name in all_names:
-        # Try exact match first
-        mask = df[PLAYER_COL].astype(str).str.lower() == search_name.lower()
-        if mask.any():
-            return df[mask]
+
+def match_ghana_players(df):
+    """Match all Ghana players against the dataset in one pass
+
+    Returns a Series mapping canonical name -> index label of the first matching row,
+    in GHANA_PLAYERS order.
+    Exact (case-insensitive) matches come from a single merge on the lowercased
+    Player column; players without an exact hit fall back to one regex contains pass.
+    Note that an exact hit on any alias now beats a contains hit on an earlier alias
+    (the old per-alias loop tried exact then contains for each alias in turn).
+    """
+    lname = df[PLAYER_COL].astype(str).str.lower()
+    
+    # Exact matches: earliest alias wins, then first row in the dataset
+    exact = (lname.rename('alias').rename_axis('row').reset_index()
+             .merge(_GHANA_ALIASES, on='alias')
+             .sort_values(['rank', 'row'], kind='stable')
+             .drop_duplicates('canonical'))
+    matches = dict(zip(exact['canonical'], exact['row']))
+    
+    # Contains fallback for anyone still missing
+    remaining = _GHANA_ALIASES[~_GHANA_ALIASES['canonical'].isin(matches)]
+    if not remaining.empty:
+        pattern = '|'.join(re.escape(a) for a in remaining['alias'].unique())
+        candidates = lname[lname.str.contains(pattern, regex=True, na=False)]
         
-        # Try contains
-        mask = df[PLAYER_COL].astype(str).str.lower().str.contains(search_name.lower(), na=False)
-        if mask.any():
-            return df[mask]
-    
-    return pd.DataFrame()
+        for canonical, group in remaining.groupby('canonical', sort=False):
+            for alias in group.sort_values('rank')['alias']:
+                hits = candidates[candidates.str.contains(alias, regex=False)]
+                if not hits.empty:
+                    matches[canonical] = hits.index[0]
+                    break
+    
+    found = [c for c in GHANA_PLAYERS if c in matches]
+    return pd.Series([matches[c] for c in found], index=found, dtype=object)
 
 
 def main():
@@ -66,12 +93,18 @@ def main():
     
     # Load data
     data_file = PROCESSED_DIR / "forwards_clustered.csv"
-    if not data_file.exists():
+    parquet_file = data_file.with_suffix('.parquet')
+    
+    if parquet_file.exists() and (not data_file.exists() or
+                                  parquet_file.stat().st_mtime >= data_file.stat().st_mtime):
+        df = pd.read_parquet(parquet_file)
+    elif data_file.exists():
+        df = pd.read_csv(data_file)
+    else:
         print(f"❌ File not found: {data_file}")
         print("   Run Notebook 03 first!")
         return
     
-    df = pd.read_csv(data_file)
     print(f"\n✅ Loaded {len(df)} unique forwards")
     
     # Load cluster names
@@ -86,23 +119,20 @@ def main():
     # Find Ghana players
     print("\n🔍 Searching for Ghana players...\n")
     
-    ghana_rows = []
     found_players = []
     not_found_players = []
     
-    for canonical_name, aliases in GHANA_PLAYERS.items():
-        result = find_player(df, canonical_name, aliases)
-        
-        if not result.empty:
-            result = result.copy()
-            result['ghana_name'] = canonical_name
-            ghana_rows.append(result.iloc[[0]])  # Take first match only
+    matches = match_ghana_players(df)
+    
+    for canonical_name in GHANA_PLAYERS:
+        if canonical_name in matches.index:
             found_players.append(canonical_name)
             
-            cluster_id = result['cluster'].iloc[0]
+            row = df.loc[matches[canonical_name]]
+            cluster_id = row['cluster']
             cluster_name = cluster_names.get(cluster_id, f"Cluster {cluster_id}")
-            team = result[SQUAD_COL].iloc[0]
-            league = result.get(LEAGUE_COL, pd.Series([''])).iloc[0]
+            team = row[SQUAD_COL]
+            league = row.get(LEAGUE_COL, '')
             
             print(f"  ✅ {canonical_name}")
             print(f"     → {team}, {league}")
@@ -111,11 +141,14 @@ def main():
             not_found_players.append(canonical_name)
             print(f"  ❌ {canonical_name} - NOT FOUND")
     
-    if not ghana_rows:
+    if matches.empty:
         print("\n❌ No Ghana players found!")
         return
     
-    ghana_df = pd.concat(ghana_rows, ignore_index=True)
+    # One slice for all matched rows instead of concatenating one-row frames
+    ghana_df = (df.loc[matches.values]
+                .assign(ghana_name=matches.index)
+                .reset_index(drop=True))
     ghana_df['cluster_name'] = ghana_df['cluster'].map(cluster_names)
     
     # Summary
@@ -133,13 +166,12 @@ def main():
     print("🏆 SQUAD COMPOSITION BY PLAYER TYPE")
     print("="*60)
     
-    composition = ghana_df.groupby(['cluster', 'cluster_name']).size().reset_index(name='count')
-    composition = composition.sort_values('count', ascending=False)
+    players_by_cluster = ghana_df.groupby(['cluster', 'cluster_name'])['ghana_name'].agg(list)
+    counts = players_by_cluster.map(len).sort_values(ascending=False, kind='stable')
     
-    for _, row in composition.iterrows():
-        players_in_cluster = ghana_df[ghana_df['cluster'] == row['cluster']]['ghana_name'].tolist()
-        print(f"\n{row['cluster_name']}: {row['count']} players")
-        for p in players_in_cluster:
+    for (cluster_id, cluster_name), count in counts.items():
+        print(f"\n{cluster_name}: {count} players")
+        for p in players_by_cluster[(cluster_id, cluster_name)]:
             print(f"   • {p}")
     
     # Gap analysis
@@ -0,0 +1,3 @@
+"""
+BlackStars: FBref scraping, forward processing and K-Means player role clustering
+"""
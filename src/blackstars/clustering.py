@@ -5,33 +5,37 @@ K-Means Clustering Engine for Player Role Identification
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
 import pickle
 
-import sys
-sys.path.append(str(Path(__file__).parent.parent))
-
-from config import PROCESSED_DATA_DIR, OUTPUT_DIR, N_CLUSTERS_RANGE
+from blackstars.config import PROCESSED_DATA_DIR, OUTPUT_DIR, N_CLUSTERS_RANGE
 
 
 def load_processed_data() -> pd.DataFrame:
-    """Load the processed forwards data"""
-    filepath = f"{PROCESSED_DATA_DIR}/forwards_processed.csv"
-    
-    if not Path(filepath).exists():
+    """Load the processed forwards data, preferring the Parquet copy if it is current"""
+    filepath = Path(f"{PROCESSED_DATA_DIR}/forwards_processed.csv")
+    parquet_path = filepath.with_suffix('.parquet')
+    
+    if parquet_path.exists() and (not filepath.exists() or
+                                  parquet_path.stat().st_mtime >= filepath.stat().st_mtime):
+        df = pd.read_parquet(parquet_path)
+    elif filepath.exists():
+        df = pd.read_csv(filepath)
+    else:
         print(f"✗ Processed data not found at {filepath}")
         print("  Run processor.py first!")
         return pd.DataFrame()
     
-    df = pd.read_csv(filepath)
     print(f"✓ Loaded {len(df)} forwards from processed data")
     return df
 
 
 def select_clustering_features(df: pd.DataFrame) -> tuple:
-    """Select features for clustering"""
+    """Select features for clustering
+
+    Returns the feature matrix as a float32 ndarray (NaN -> 0) and the feature names.
+    """
     # Core features for clustering
     feature_candidates = [
         # Finishing
@@ -58,49 +62,56 @@ def select_clustering_features(df: pd.DataFrame) -> tuple:
     for f in available_features:
         print(f"    - {f}")
     
-    return df[available_features].fillna(0), available_features
+    # Contiguous float32 buffer with NaNs zeroed in place, ready for scaling/KMeans
+    # (copy=True: float32 columns would otherwise come back as a read-only view)
+    X = df[available_features].to_numpy(dtype=np.float32, copy=True)
+    np.nan_to_num(X, copy=False, nan=0.0)
+    
+    return X, available_features
+
 
+def find_optimal_clusters(X_scaled: np.ndarray) -> int:
+    """Use the elbow method on inertia to find optimal k
 
-def find_optimal_clusters(X: pd.DataFrame) -> int:
-    """Use elbow method and silhouette score to find optimal k"""
+    The sweep uses MiniBatchKMeans and picks the knee of the inertia curve (largest
+    second difference), avoiding the O(N^2) silhouette score; the final model is
+    still fit with full KMeans.
+    """
     print("\n" + "="*60)
     print("FINDING OPTIMAL NUMBER OF CLUSTERS")
     print("="*60)
     
+    k_values = list(N_CLUSTERS_RANGE)
     inertias = []
-    silhouette_scores = []
     
-    for k in N_CLUSTERS_RANGE:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        kmeans.fit(X)
+    for k in k_values:
+        kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, batch_size=1024,
+                                 n_init=3, max_iter=100)
+        kmeans.fit(X_scaled)
         
         inertias.append(kmeans.inertia_)
-        sil_score = silhouette_score(X, kmeans.labels_)
-        silhouette_scores.append(sil_score)
-        
-        print(f"  k={k}: Inertia={kmeans.inertia_:.2f}, Silhouette={sil_score:.3f}")
+        print(f"  k={k}: Inertia={kmeans.inertia_:.2f}")
     
-    # Find k with best silhouette score
-    best_k = list(N_CLUSTERS_RANGE)[np.argmax(silhouette_scores)]
-    print(f"\n✓ Optimal k = {best_k} (best silhouette score)")
+    if len(k_values) < 3:
+        best_k = k_values[0]
+    else:
+        # Knee = k where the drop in inertia slows down the most
+        curvature = np.diff(inertias, 2)
+        best_k = k_values[np.argmax(curvature) + 1]
+    print(f"\n✓ Optimal k = {best_k} (elbow of inertia curve)")
     
     return best_k
 
 
-def run_clustering(df: pd.DataFrame, n_clusters: int) -> tuple:
-    """Run K-Means clustering"""
+def run_clustering(df: pd.DataFrame, X_scaled: np.ndarray, feature_names: list,
+                   n_clusters: int) -> tuple:
+    """Run K-Means clustering on the already selected and scaled features"""
     print("\n" + "="*60)
     print(f"RUNNING K-MEANS CLUSTERING (k={n_clusters})")
     print("="*60)
     
-    # Select and scale features
-    X, feature_names = select_clustering_features(df)
-    
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
     # Run K-Means
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
     clusters = kmeans.fit_predict(X_scaled)
     
     # Add cluster assignments to dataframe
@@ -118,7 +129,7 @@ def run_clustering(df: pd.DataFrame, n_clusters: int) -> tuple:
                 mean_val = cluster_df[feat].mean()
                 print(f"    - {feat}: {mean_val:.3f}")
     
-    return df, kmeans, scaler, feature_names
+    return df, kmeans
 
 
 def analyze_cluster_profiles(df: pd.DataFrame, feature_names: list) -> dict:
@@ -129,26 +140,20 @@ def analyze_cluster_profiles(df: pd.DataFrame, feature_names: list) -> dict:
     
     cluster_profiles = {}
     
-    for cluster_id in df['cluster'].unique():
-        cluster_df = df[df['cluster'] == cluster_id]
-        
-        # Calculate z-scores compared to overall mean
-        profile = {}
-        for feat in feature_names:
-            if feat in cluster_df.columns:
-                cluster_mean = cluster_df[feat].mean()
-                overall_mean = df[feat].mean()
-                overall_std = df[feat].std()
-                
-                if overall_std > 0:
-                    z_score = (cluster_mean - overall_mean) / overall_std
-                else:
-                    z_score = 0
-                
-                profile[feat] = {
-                    'mean': cluster_mean,
-                    'z_score': z_score
-                }
+    features = [f for f in feature_names if f in df.columns]
+    
+    # Calculate z-scores of every cluster mean compared to the overall mean
+    grouped = df.groupby('cluster', sort=False)
+    sizes = grouped.size()
+    means = grouped[features].mean()
+    overall_std = df[features].std()
+    z_scores = ((means - df[features].mean()) / overall_std.where(overall_std > 0)).fillna(0)
+    
+    for cluster_id, z_row in z_scores.iterrows():
+        profile = {
+            feat: {'mean': means.at[cluster_id, feat], 'z_score': z_row[feat]}
+            for feat in features
+        }
         
         # Sort by z-score to find defining characteristics
         sorted_traits = sorted(profile.items(), 
@@ -160,12 +165,12 @@ def analyze_cluster_profiles(df: pd.DataFrame, feature_names: list) -> dict:
         
         cluster_profiles[cluster_id] = {
             'name': cluster_name,
-            'size': len(cluster_df),
+            'size': sizes[cluster_id],
             'traits': sorted_traits[:5]
         }
         
         print(f"\n  Cluster {cluster_id}: {cluster_name}")
-        print(f"    Size: {len(cluster_df)} players")
+        print(f"    Size: {sizes[cluster_id]} players")
         print(f"    Key traits:")
         for trait, vals in sorted_traits[:3]:
             direction = "↑" if vals['z_score'] > 0 else "↓"
@@ -226,12 +231,16 @@ def main():
     if df.empty:
         return
     
-    # Find optimal number of clusters
+    # Select and scale features once for both the k sweep and the final fit
     X, feature_names = select_clustering_features(df)
-    optimal_k = find_optimal_clusters(X)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    
+    # Find optimal number of clusters
+    optimal_k = find_optimal_clusters(X_scaled)
     
     # Run clustering
-    df, kmeans, scaler, feature_names = run_clustering(df, optimal_k)
+    df, kmeans = run_clustering(df, X_scaled, feature_names, optimal_k)
     
     # Analyze cluster profiles
     cluster_profiles = analyze_cluster_profiles(df, feature_names)
@@ -239,7 +248,8 @@ def main():
     # Save results
     output_file = f"{PROCESSED_DATA_DIR}/forwards_clustered.csv"
     df.to_csv(output_file, index=False)
-    print(f"\n✓ Saved clustered data to {output_file}")
+    df.to_parquet(output_file.replace('.csv', '.parquet'), index=False)
+    print(f"\n✓ Saved clustered data to {output_file} (+ .parquet)")
     
     # Save model
     save_model(kmeans, scaler, feature_names, cluster_profiles)
@@ -17,6 +17,18 @@ LEAGUES = [
 # Seasons to scrape
 SEASONS = ["2024-2025", "2025-2026"]
 
+# Seconds soccerdata waits after each FBref download. None keeps soccerdata's own
+# FBref value (7 s in soccerdata 1.9); lower values risk 429s and temporary bans.
+FBREF_RATE_LIMIT = None
+
+# On-disk cache of downloaded FBref pages (re-runs read from here instead of FBref).
+# Pages are kept indefinitely; set a max age in days to refresh the current season.
+FBREF_CACHE_DIR = "data/cache/fbref"
+FBREF_CACHE_MAX_AGE_DAYS = None
+
+# Scraper log level ("DEBUG" also logs every stat table request)
+SCRAPER_LOG_LEVEL = "INFO"
+
 # Ghana Black Stars Forwards (as specified by user)
 GHANA_FORWARDS = [
     "Mohammed Kudus",
@@ -83,6 +95,21 @@ METRICS = {
     }
 }
 
+# Also write each raw stat table as CSV next to its Parquet file (for other tools).
+# CSV copies are zstd-compressed (.csv.zst, needs the zstandard package); "gzip",
+# "bz2" and "xz" are also accepted, or None for plain .csv when debugging.
+RAW_CSV_EXPORT = False
+RAW_CSV_COMPRESSION = "zstd"
+
+# Default columns read from the scraped master dataset (data/raw/master) by
+# scraper.load_master(), so only they are read from the wide tables.
+READ_COLS = [
+    "player", "team", "league", "season", "nation", "pos", "age",
+    "Playing Time_Min", "Playing Time_90s",
+    "Performance_Gls", "Performance_Ast",
+    "Expected_xG", "Expected_npxG", "Expected_xAG",
+]
+
 # Output directories
 DATA_DIR = "data"
 RAW_DATA_DIR = f"{DATA_DIR}/raw"
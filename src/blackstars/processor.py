@@ -3,46 +3,106 @@ Feature Engineering and Data Processing
 Normalizes stats and prepares data for clustering
 """
 
+import csv
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.preprocessing import MinMaxScaler
-
-import sys
-sys.path.append(str(Path(__file__).parent.parent))
 
-from config import (
+from blackstars.config import (
     RAW_DATA_DIR, PROCESSED_DATA_DIR, METRICS, 
     MIN_MINUTES_PLAYED, FORWARD_POSITIONS
 )
 
+# Heavily repeated string columns stored as categoricals after loading. These are the
+# legacy CSV names; scraper Parquet columns are renamed to match (_PARQUET_RENAMES).
+_CATEGORICAL_COLS = ['Player', 'Squad', 'Pos', 'Nation', '_league', '_season']
+
+# soccerdata's identity columns in scraper Parquet files -> the processed schema's names
+_PARQUET_RENAMES = {
+    'player': 'Player', 'team': 'Squad', 'pos': 'Pos', 'nation': 'Nation',
+    'age': 'Age', 'born': 'Born', 'league': '_league', 'season': '_season',
+}
+
+# Position codes that mark a player as a forward/attacker
+_FWD_RE = re.compile('|'.join(['FW', 'LW', 'RW', 'ST', 'CF']), re.IGNORECASE)
+
+
+def _read_csv(csv_file: Path) -> pd.DataFrame:
+    """Read a raw CSV with the multithreaded pyarrow parser
+
+    pyarrow keeps duplicate header names as-is while the C engine de-duplicates them,
+    so files with a repeated name in the header row (e.g. old MultiIndex exports)
+    go straight to the C engine.
+    """
+    with open(csv_file, newline='', encoding='utf-8', errors='replace') as f:
+        header = next(csv.reader(f), [])
+    if len(set(header)) < len(header):
+        return pd.read_csv(csv_file)
+    return pd.read_csv(csv_file, engine='pyarrow')
+
+
+def _flatten_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn a scraper Parquet frame into flat columns like the master dataset
+
+    The (league, season, team, player) index becomes columns and soccerdata's
+    (group, stat) columns are joined, e.g. ('Performance', 'Gls') -> 'Performance_Gls'.
+    Identity columns are renamed to the names used downstream (team -> Squad, ...).
+    """
+    df.columns = [
+        '_'.join(str(p) for p in col if p and not str(p).startswith('Unnamed'))
+        if isinstance(col, tuple) else col
+        for col in df.columns
+    ]
+    return df.reset_index().rename(columns=_PARQUET_RENAMES)
+
+
+def _read_raw_file(raw_file: Path) -> pd.DataFrame:
+    """Read a raw stats file saved by the scraper (Parquet) or an older CSV"""
+    if raw_file.suffix == '.parquet':
+        return _flatten_parquet(pd.read_parquet(raw_file))
+    return _read_csv(raw_file)
+
+
+def _raw_files(raw_path: Path, stat_type: str) -> list:
+    """All raw files of a stat type: Parquet, plus CSVs that have no Parquet counterpart"""
+    parquet_files = list(raw_path.glob(f"*_{stat_type}.parquet"))
+    stems = {f.stem for f in parquet_files}
+    csv_files = [f for f in raw_path.glob(f"*_{stat_type}.csv") if f.stem not in stems]
+    return sorted(parquet_files + csv_files)
+
+
+def _read_raw_files(raw_files: list) -> list:
+    """Parse several raw files concurrently (the parsers release the GIL), preserving order"""
+    if not raw_files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(raw_files))) as executor:
+        return list(executor.map(_read_raw_file, raw_files))
+
 
 def load_raw_data() -> pd.DataFrame:
-    """Load all raw CSV files and combine into single DataFrame"""
+    """Load all raw stats files and combine into single DataFrame"""
     raw_path = Path(RAW_DATA_DIR)
-    all_dfs = []
     
     # Find all standard stats files (these have the base player info)
-    for csv_file in raw_path.glob("*_standard.csv"):
-        print(f"Loading: {csv_file.name}")
-        df = pd.read_csv(csv_file)
-        
-        # Extract league and season from filename
-        parts = csv_file.stem.split("_")
-        # Handle multi-word league names
-        if "standard" in parts:
-            idx = parts.index("standard")
-            season = "_".join(parts[idx-2:idx])
-            league = "_".join(parts[:idx-2])
-        
-        df['source_file'] = csv_file.name
-        all_dfs.append(df)
+    raw_files = _raw_files(raw_path, "standard")
+    for raw_file in raw_files:
+        print(f"Loading: {raw_file.name}")
+    
+    all_dfs = _read_raw_files(raw_files)
+    for raw_file, df in zip(raw_files, all_dfs):
+        df['source_file'] = raw_file.name
     
     if not all_dfs:
         print("No raw data files found!")
         return pd.DataFrame()
     
     combined = pd.concat(all_dfs, ignore_index=True)
+    for col in _CATEGORICAL_COLS:
+        if col in combined.columns:
+            combined[col] = combined[col].astype('category')
     print(f"\n✓ Loaded {len(combined)} total player records")
     return combined
 
@@ -50,11 +110,7 @@ def load_raw_data() -> pd.DataFrame:
 def load_stat_type(stat_type: str) -> pd.DataFrame:
     """Load all files of a specific stat type"""
     raw_path = Path(RAW_DATA_DIR)
-    all_dfs = []
-    
-    for csv_file in raw_path.glob(f"*_{stat_type}.csv"):
-        df = pd.read_csv(csv_file)
-        all_dfs.append(df)
+    all_dfs = _read_raw_files(_raw_files(raw_path, stat_type))
     
     if all_dfs:
         return pd.concat(all_dfs, ignore_index=True)
@@ -78,14 +134,16 @@ def identify_columns(df: pd.DataFrame) -> dict:
         'xag': ['xag', 'xAG', 'xa', 'xA'],
     }
     
+    # Lowercase every column name once, keeping the first column for each
+    lower_cols = {}
+    for col in df.columns:
+        lower_cols.setdefault(str(col).lower(), col)
+    
     for key, possible_names in patterns.items():
-        for col in df.columns:
-            col_str = str(col).lower()
-            for name in possible_names:
-                if name.lower() in col_str:
-                    col_mapping[key] = col
-                    break
-            if key in col_mapping:
+        names = {name.lower() for name in possible_names}
+        for col_str, col in lower_cols.items():
+            if any(name in col_str for name in names):
+                col_mapping[key] = col
                 break
     
     return col_mapping
@@ -98,10 +156,7 @@ def filter_forwards(df: pd.DataFrame, col_mapping: dict) -> pd.DataFrame:
         return df
     
     pos_col = col_mapping['position']
-    mask = df[pos_col].astype(str).str.upper().str.contains(
-        '|'.join(['FW', 'LW', 'RW', 'ST', 'CF']), 
-        na=False
-    )
+    mask = df[pos_col].astype('string').str.contains(_FWD_RE, na=False)
     
     filtered = df[mask].copy()
     print(f"✓ Filtered to {len(filtered)} forwards/attackers")
@@ -119,8 +174,13 @@ def deduplicate_players(df: pd.DataFrame, col_mapping: dict) -> pd.DataFrame:
     
     before_count = len(df)
     
-    # Drop duplicates based on Player + Squad, keeping first occurrence
-    df = df.drop_duplicates(subset=[player_col, team_col], keep='first')
+    # Drop duplicates based on Player + Squad, keeping first occurrence.
+    # Both columns are reduced to categorical codes and packed into one int64 key,
+    # so the hash runs on a single integer column instead of string tuples.
+    player_codes = df[player_col].astype('category').cat.codes.to_numpy(dtype=np.int64)
+    team_codes = df[team_col].astype('category').cat.codes.to_numpy(dtype=np.int64)
+    key = (player_codes << 32) | (team_codes & 0xFFFFFFFF)
+    df = df[~pd.Series(key).duplicated(keep='first').to_numpy()]
     
     after_count = len(df)
     removed = before_count - after_count
@@ -164,25 +224,33 @@ def normalize_per_90(df: pd.DataFrame, col_mapping: dict) -> pd.DataFrame:
     # Columns to convert to per-90
     counting_stats = ['goals', 'assists', 'xg', 'npxg', 'xag']
     
-    for stat in counting_stats:
-        if stat in col_mapping:
-            col = col_mapping[stat]
-            if col in df.columns:
-                new_col = f"{stat}_per90"
-                df[new_col] = df[col].astype(float) / df['90s_played'].replace(0, np.nan)
+    stats = [s for s in counting_stats if s in col_mapping and col_mapping[s] in df.columns]
+    if not stats:
+        return df
+    
+    # Divide all counting stats by 90s played in one broadcast
+    counts = df[[col_mapping[s] for s in stats]].to_numpy(dtype=float)
+    nineties = df['90s_played'].to_numpy(dtype=float)
+    nineties = np.where(nineties == 0, np.nan, nineties)
+    df[[f"{s}_per90" for s in stats]] = counts / nineties[:, None]
     
     return df
 
 
 def normalize_features(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
-    """Apply MinMax scaling to normalize features to 0-1 range"""
-    scaler = MinMaxScaler()
-    
+    """Apply min-max scaling to normalize features to 0-1 range"""
     # Only scale columns that exist
     existing_cols = [col for col in feature_cols if col in df.columns]
     
     if existing_cols:
-        df[existing_cols] = scaler.fit_transform(df[existing_cols].fillna(0))
+        # copy=True: without a dtype change to_numpy returns a read-only view under copy-on-write
+        X = df[existing_cols].to_numpy(dtype=float, copy=True)
+        np.nan_to_num(X, copy=False, nan=0.0)
+        lo = X.min(axis=0)
+        hi = X.max(axis=0)
+        # Constant columns map to 0, as with MinMaxScaler
+        span = np.where(hi > lo, hi - lo, 1.0)
+        df[existing_cols] = (X - lo) / span
         print(f"✓ Normalized {len(existing_cols)} features to 0-1 scale")
     
     return df
@@ -238,7 +306,8 @@ def process_data():
     # Save processed data
     output_file = f"{PROCESSED_DATA_DIR}/forwards_processed.csv"
     df.to_csv(output_file, index=False)
-    print(f"\n✓ Saved processed data: {output_file}")
+    df.to_parquet(output_file.replace('.csv', '.parquet'), index=False)
+    print(f"\n✓ Saved processed data: {output_file} (+ .parquet)")
     print(f"  Total forwards: {len(df)}")
     
     return df
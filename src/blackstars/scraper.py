@@ -0,0 +1,412 @@
+"""
+Data Scraper for FBref using soccerdata library
+Collects player statistics from multiple leagues
+
+Standard stats for every league/season also go to a Parquet dataset partitioned by
+league and season (data/raw/master). load_master() is an optional helper for ad-hoc
+analysis that reads only config.READ_COLS by default; the processor reads the
+per-file raw stats instead.
+"""
+
+import argparse
+import asyncio
+import atexit
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow.dataset as ds
+from pathlib import Path
+
+from blackstars.config import (
+    LEAGUES, SEASONS, RAW_DATA_DIR, FORWARD_POSITIONS, FBREF_RATE_LIMIT,
+    FBREF_CACHE_DIR, FBREF_CACHE_MAX_AGE_DAYS, READ_COLS,
+    RAW_CSV_EXPORT, RAW_CSV_COMPRESSION, SCRAPER_LOG_LEVEL
+)
+
+# soccerdata reads its cache expiry from the environment at import time
+if FBREF_CACHE_MAX_AGE_DAYS is not None:
+    os.environ.setdefault("SOCCERDATA_MAXAGE", str(FBREF_CACHE_MAX_AGE_DAYS))
+
+import soccerdata as sd
+
+# Player stat tables fetched for every league/season. soccerdata's FBref reader has no
+# passing/possession/gca player tables (it raises TypeError), and since those files
+# were never saved they kept every pair looking unfinished on each re-run.
+STAT_TYPES = ("standard", "shooting", "misc")
+
+# Position codes counted as forwards. Player positions are split on "," before the
+# lookup, so compound entries such as "MF,FW" are already covered by "FW".
+FORWARD_SET = frozenset(p.upper() for p in FORWARD_POSITIONS)
+
+# Standard stats for every league/season, partitioned by league and season
+MASTER_DATASET_DIR = Path(RAW_DATA_DIR) / "master"
+
+# File suffix of the raw CSV copy for each RAW_CSV_COMPRESSION method
+CSV_SUFFIXES = {None: ".csv", "gzip": ".csv.gz", "bz2": ".csv.bz2", "xz": ".csv.xz",
+                "zstd": ".csv.zst"}
+if RAW_CSV_COMPRESSION not in CSV_SUFFIXES:
+    raise ValueError(f"RAW_CSV_COMPRESSION must be one of {list(CSV_SUFFIXES)}, "
+                     f"got {RAW_CSV_COMPRESSION!r}")
+
+# Worker threads for blocking soccerdata reads and file writes
+MAX_WORKERS = 4
+
+log = logging.getLogger(__name__)
+log.setLevel(SCRAPER_LOG_LEVEL)
+
+# Background listener that drains queued log records (started by configure_logging)
+_log_listener = None
+
+
+def configure_logging(level=None):
+    """Route root log records through a queue drained by one background thread
+
+    The root handlers already installed (soccerdata sets up a console and log files
+    at import) move behind a QueueListener, so worker threads only enqueue records
+    and never block on the console or disk. Called from the command line entry point
+    only; scrape_all() leaves the application's logging setup alone.
+    """
+    global _log_listener
+    if level is not None:
+        log.setLevel(level)
+    if _log_listener is not None:
+        return
+    
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    if not handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers = [handler]
+    
+    log_queue = queue.SimpleQueue()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                                   respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+def create_directories():
+    """Create necessary data directories"""
+    Path(RAW_DATA_DIR).mkdir(parents=True, exist_ok=True)
+    log.info(f"✓ Created directory: {RAW_DATA_DIR}")
+
+
+async def _fetch(gate: asyncio.Semaphore, func, *args):
+    """Run a blocking soccerdata call in a worker thread, one request at a time.
+
+    The gate is shared by every (league, season) task so the global request rate
+    stays within FBref's limits while other tasks overlap their non-HTTP work.
+    Spacing between requests is left to soccerdata's own rate limiter, which
+    only sleeps after real downloads (cache hits return immediately).
+    """
+    loop = asyncio.get_running_loop()
+    async with gate:
+        return await loop.run_in_executor(None, func, *args)
+
+
+@functools.lru_cache(maxsize=None)
+def _clean(name: str) -> str:
+    """Filename-safe form of a league or season name ("ENG-Premier League" -> "ENG_Premier_League")"""
+    return name.replace(" ", "_").replace("-", "_")
+
+
+def stats_path(league: str, season: str, stat_type: str) -> Path:
+    """Path of the saved raw stats file for a league/season/stat type"""
+    return Path(RAW_DATA_DIR) / f"{_clean(league)}_{_clean(season)}_{stat_type}.parquet"
+
+
+def load_saved_stats(filename: Path) -> pd.DataFrame:
+    """Load a stats file written by save_stats"""
+    return pd.read_parquet(filename)
+
+
+def create_reader(leagues: list, seasons: list):
+    """Create the single FBref reader shared by every league and season that needs fetching"""
+    fbref = sd.FBref(leagues=leagues, seasons=seasons,
+                     no_cache=False, data_dir=Path(FBREF_CACHE_DIR))
+    if FBREF_RATE_LIMIT is not None:
+        fbref.rate_limit = FBREF_RATE_LIMIT
+    return fbref
+
+
+async def _read_stat_table(fbref, stat_type: str, gate: asyncio.Semaphore,
+                           fetched: dict) -> pd.DataFrame:
+    """Fetch a stat table for all leagues/seasons once; concurrent callers share the result"""
+    if stat_type not in fetched:
+        fetched[stat_type] = asyncio.ensure_future(
+            _fetch(gate, fbref.read_player_season_stats, stat_type)
+        )
+    return await fetched[stat_type]
+
+
+async def _safe_read(fbref, stat_type: str, league: str, season: str, season_key: str,
+                     gate: asyncio.Semaphore, fetched: dict) -> pd.DataFrame:
+    """Read one stat table for a league/season; logs and returns an empty frame on failure"""
+    log.debug(f"  → Fetching {stat_type} stats ({league} {season})...")
+    
+    # The reader returns every league/season at once, keyed by soccerdata's season code
+    try:
+        table = await _read_stat_table(fbref, stat_type, gate, fetched)
+        df = table.xs((league, season_key), level=['league', 'season'], drop_level=False)
+    except KeyError:
+        log.warning(f"    ✗ {stat_type} stats: no rows for {league} {season}")
+        return pd.DataFrame()
+    except Exception as e:
+        log.warning(f"    ✗ {stat_type} stats failed: {e}")
+        return pd.DataFrame()
+    
+    log.info(f"    ✓ {stat_type} stats: {len(df)} players")
+    return df
+
+
+async def scrape_league_season(fbref, league: str, season: str, season_key: str,
+                               gate: asyncio.Semaphore, fetched: dict,
+                               force: bool = False) -> dict:
+    """
+    Scrape all relevant player stats for a single league and season
+    
+    Args:
+        fbref: Shared FBref reader for all leagues/seasons (None if nothing needs fetching)
+        league: FBref league code (e.g., "ENG-Premier League")
+        season: Season string (e.g., "2024-2025")
+        season_key: soccerdata's code for the season in the reader's tables (e.g., "2425")
+        gate: Shared semaphore that serializes requests to FBref
+        fetched: Per-run cache of stat tables already requested from the reader
+        force: Re-fetch stat types even if they were saved by a previous run
+    
+    Returns:
+        Dictionary containing DataFrames for each stat type
+    """
+    log.info(f"Scraping: {league} - {season}")
+    
+    stats = {}
+    missing = []
+    
+    # Reuse stat files from earlier runs instead of hitting FBref again
+    for stat_type in STAT_TYPES:
+        filename = stats_path(league, season, stat_type)
+        if not force and filename.exists():
+            stats[stat_type] = load_saved_stats(filename)
+            log.info(f"  ↺ {stat_type} stats: already saved ({len(stats[stat_type])} players)")
+        else:
+            missing.append(stat_type)
+    
+    if not missing:
+        return stats
+    
+    if fbref is None:
+        log.error(f"  ✗ Failed to scrape {league} {season}: no FBref reader")
+        return stats
+    
+    for stat_type in missing:
+        stats[stat_type] = await _safe_read(fbref, stat_type, league, season, season_key,
+                                            gate, fetched)
+    
+    return stats
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_position_column(columns: tuple):
+    """Find the position column for a table schema (cached: schemas repeat per stat type)"""
+    # Check for position column (may have different names)
+    for col in ('Pos', 'pos', 'Position', 'position'):
+        if col in columns:
+            return col
+    
+    # Try multi-index columns
+    for col in columns:
+        if isinstance(col, tuple) and 'pos' in str(col).lower():
+            return col
+    
+    return None
+
+
+def filter_forwards(df: pd.DataFrame) -> pd.DataFrame:
+    """Filter DataFrame to only include forwards/attackers"""
+    if df.empty:
+        return df
+    
+    pos_col = _resolve_position_column(tuple(df.columns))
+    
+    if pos_col is None:
+        log.warning("    ⚠ Could not find position column, returning all players")
+        return df
+    
+    # Filter for forward positions: split "FW,MF"-style codes and test each against the set
+    codes = (df[pos_col].astype(str).str.upper().reset_index(drop=True)
+             .str.split(',').explode().str.strip())
+    mask = codes.isin(FORWARD_SET).groupby(level=0).any().to_numpy()
+    filtered = df[mask]
+    
+    log.info(f"    → Filtered to {len(filtered)} forwards/attackers")
+    return filtered
+
+
+def save_stats(stats: dict, league: str, season: str, overwrite: bool = True):
+    """Save scraped stats to Parquet files (existing files are kept unless overwrite)
+
+    Parquet keeps soccerdata's MultiIndex columns/index and dtypes, so files load
+    back without re-parsing text. With RAW_CSV_EXPORT a (compressed) CSV copy is
+    written alongside.
+    """
+    for stat_type, df in stats.items():
+        filename = stats_path(league, season, stat_type)
+        if not df.empty and (overwrite or not filename.exists()):
+            df.to_parquet(filename, engine='pyarrow', compression='zstd', index=True)
+            log.info(f"  ✓ Saved: {filename}")
+            
+            if RAW_CSV_EXPORT:
+                csv_file = filename.with_suffix(CSV_SUFFIXES[RAW_CSV_COMPRESSION])
+                if RAW_CSV_COMPRESSION == 'zstd':
+                    df.to_csv(csv_file, compression={'method': 'zstd', 'level': 3})
+                else:
+                    df.to_csv(csv_file, compression=RAW_CSV_COMPRESSION)
+                log.info(f"  ✓ Saved: {csv_file}")
+
+
+def save_master_partition(df: pd.DataFrame) -> int:
+    """Write one league/season of standard stats into the partitioned master dataset
+
+    df must carry flat 'league' and 'season' columns; they become the partition keys.
+    Re-writing a league/season replaces its partition. Returns the number of rows written.
+    """
+    # Flatten soccerdata's (group, stat) columns, e.g. ('Performance', 'Gls') -> 'Performance_Gls'
+    df.columns = [
+        '_'.join(str(p) for p in col if p and not str(p).startswith('Unnamed'))
+        if isinstance(col, tuple) else col
+        for col in df.columns
+    ]
+    # league/season already exist as columns; keep team/player from the index
+    df = df.reset_index([n for n in df.index.names if n not in ('league', 'season')])
+    df = df.reset_index(drop=True)
+    
+    df.to_parquet(MASTER_DATASET_DIR, engine='pyarrow', compression='zstd', index=False,
+                  partition_cols=['league', 'season'],
+                  existing_data_behavior='delete_matching')
+    return len(df)
+
+
+def _persist_pair(stats: dict, league: str, season: str, force: bool) -> int:
+    """Save one pair's stat tables and its master partition; returns players written"""
+    if not stats:
+        return 0
+    
+    save_stats(stats, league, season, overwrite=force)
+    
+    # Append this league/season to the master dataset, tagged with categorical
+    # league/season columns (one small code per row instead of a string reference)
+    standard = stats.get('standard')
+    if standard is not None and not standard.empty:
+        n = len(standard)
+        return save_master_partition(standard.assign(
+            league=pd.Categorical([league] * n, categories=LEAGUES),
+            season=pd.Categorical([season] * n, categories=SEASONS),
+        ))
+    return 0
+
+
+def load_master(columns: list = READ_COLS) -> pd.DataFrame:
+    """Load the master dataset, reading only the given columns (None reads all)"""
+    if not MASTER_DATASET_DIR.exists():
+        return pd.DataFrame()
+    
+    if columns is not None:
+        schema = ds.dataset(MASTER_DATASET_DIR, partitioning='hive').schema
+        columns = [c for c in columns if c in schema.names]
+    return pd.read_parquet(MASTER_DATASET_DIR, columns=columns)
+
+
+async def _scrape_all_async(force: bool = False):
+    """Scrape every (league, season) pair on a bounded thread pool
+
+    Pairs that still miss stat files share one FBref reader and each stat table is
+    requested once for all of them; requests are serialized by the shared gate. Each
+    pair is persisted as soon as it finishes, so a slow pair never holds back saving
+    the others.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=MAX_WORKERS))
+    gate = asyncio.Semaphore(1)
+    fetched = {}
+    
+    # soccerdata rejects the whole reader if any league is unknown to it
+    available = set(sd.FBref.available_leagues())
+    unsupported = [league for league in LEAGUES if league not in available]
+    if unsupported:
+        log.warning(f"⚠ Not available from FBref in soccerdata, skipping: {', '.join(unsupported)}")
+    
+    # Only pairs with missing stat files go into the reader (it starts a browser, and
+    # every stat table read covers all of its leagues x seasons)
+    pending = [(league, season) for season in SEASONS for league in LEAGUES
+               if league in available and (force or any(
+                   not stats_path(league, season, stat_type).exists()
+                   for stat_type in STAT_TYPES))]
+    
+    fbref = None
+    season_keys = {}
+    if pending:
+        pending_leagues = {league for league, _ in pending}
+        pending_seasons = {season for _, season in pending}
+        leagues = [league for league in LEAGUES if league in pending_leagues]
+        seasons = [season for season in SEASONS if season in pending_seasons]
+        try:
+            fbref = await loop.run_in_executor(None, create_reader, leagues, seasons)
+            # Reader tables are keyed by soccerdata's season code, in input order
+            season_keys = dict(zip(seasons, fbref.seasons))
+        except Exception as e:
+            log.error(f"✗ Failed to create FBref reader: {e}")
+    
+    async def run_pair(league: str, season: str):
+        reader = fbref if (league, season) in pending else None
+        stats = await scrape_league_season(reader, league, season, season_keys.get(season),
+                                           gate, fetched, force)
+        return league, season, stats
+    
+    tasks = [asyncio.create_task(run_pair(league, season))
+             for season in SEASONS for league in LEAGUES]
+    
+    total_players = 0
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            league, season, stats = await next_done
+            total_players += await loop.run_in_executor(
+                None, _persist_pair, stats, league, season, force
+            )
+        except Exception as e:
+            log.error(f"  ✗ Scrape task failed: {e}")
+    return total_players
+
+
+def scrape_all(force: bool = False):
+    """Main function to scrape all leagues and seasons
+
+    Stat files saved by earlier runs are reused unless force is set.
+    """
+    create_directories()
+    
+    total_players = asyncio.run(_scrape_all_async(force))
+    
+    if total_players:
+        log.info(f"✓ Master dataset saved: {MASTER_DATASET_DIR} ({total_players} players)")
+    
+    log.info("✓ Scraping complete!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape FBref player stats")
+    parser.add_argument("--force", action="store_true",
+                        help="re-fetch stat tables that were already saved")
+    parser.add_argument("--log-level", default=SCRAPER_LOG_LEVEL,
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help=f"scraper log verbosity (default: {SCRAPER_LOG_LEVEL})")
+    args = parser.parse_args()
+    
+    configure_logging(args.log_level)
+    scrape_all(force=args.force)